@@ -1,16 +1,34 @@
 # app/db.py
 import os
+import asyncio
 import asyncpg
 from typing import Optional
 
 _pool: Optional[asyncpg.pool.Pool] = None
+_lock = asyncio.Lock()
 
 async def get_pg() -> asyncpg.pool.Pool:
     """Get (or create) a global asyncpg Pool using DATABASE_URL env var."""
     global _pool
-    if _pool is None:
-        dsn = os.getenv("DATABASE_URL")
-        if not dsn:
-            raise RuntimeError("DATABASE_URL is not set")
-        _pool = await asyncpg.create_pool(dsn, min_size=1, max_size=5)
+    if _pool is not None:
+        return _pool
+    async with _lock:
+        if _pool is None:
+            dsn = os.getenv("DATABASE_URL")
+            if not dsn:
+                raise RuntimeError("DATABASE_URL is not set")
+            _pool = await asyncpg.create_pool(
+                dsn,
+                min_size=5,
+                max_size=20,
+                max_inactive_connection_lifetime=300,
+                statement_cache_size=2048,
+                max_cached_statement_lifetime=0,
+            )
     return _pool
+
+async def close_pg() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
@@ -1,43 +1,33 @@
 # app/lib/sbc2_extract.py
 import re
-from typing import List
+from typing import List, Union
 
-# Find FUT.GG player-item images and capture the number after 25-
+# Find FUT.GG player-item .webp image URLs and capture the number after 25-
 # Example: /2025/player-item/25-67356379.f2c6...webp  -> 67356379
-_RE_CODE = re.compile(r"/player-item/25-(\d+)\.", re.IGNORECASE)
+# One sweep over the raw HTML; no attribute parsing or per-URL filtering.
+# CDN paths are case-sensitive, so the match is too; that lets a plain
+# str.find on the literal prefix skip pages (or leading bytes) with no cards.
+_CODE_PREFIX = "/player-item/25-"
+_CODE_PATTERN = r"""/player-item/25-(\d+)\.(?:[^"'\s,]*\.)?webp\b"""
+_RE_CODE = re.compile(_CODE_PATTERN, re.ASCII)
+# Same pattern for raw response bodies, so callers needn't decode the whole page
+_RE_CODE_BYTES = re.compile(_CODE_PATTERN.encode())
 
 def _dedupe_keep_order(items: List[str]) -> List[str]:
-    seen = set()
-    out = []
-    for x in items:
-        if x not in seen:
-            seen.add(x)
-            out.append(x)
-    return out
+    return list(dict.fromkeys(items))
 
-def extract_player_codes_from_html(html: str) -> List[str]:
+def extract_player_codes_from_html(html: Union[str, bytes]) -> List[str]:
     if not html:
         return []
 
-    # Collect values of src=, data-src=, srcset=
-    urls: List[str] = []
-
-    # quoted attribute values
-    for attr in ("src", "data-src", "srcset"):
-        for m in re.finditer(rf'\b{attr}\s*=\s*("|\')([^"\']+)\1', html, re.IGNORECASE):
-            val = m.group(2)
-            if attr.lower() == "srcset":
-                # srcset: "url1 1x, url2 2x"
-                urls += [p.strip().split(" ")[0] for p in val.split(",") if p.strip()]
-            else:
-                urls.append(val)
-
-    # Extract codes only from player-item .webp URLs
-    codes: List[str] = []
-    for u in urls:
-        if "/player-item/" in u and u.lower().endswith(".webp"):
-            m = _RE_CODE.search(u)
-            if m:
-                codes.append(m.group(1))
-
-    return _dedupe_keep_order(codes)
\ No newline at end of file
+    if isinstance(html, bytes):
+        start = html.find(_CODE_PREFIX.encode())
+        if start < 0:
+            return []
+        codes = [m.group(1).decode("ascii") for m in _RE_CODE_BYTES.finditer(html, start)]
+    else:
+        start = html.find(_CODE_PREFIX)
+        if start < 0:
+            return []
+        codes = [m.group(1) for m in _RE_CODE.finditer(html, start)]
+    return _dedupe_keep_order(codes)
@@ -1,20 +1,26 @@
 from __future__ import annotations
 
+import asyncio
 import os
+from hashlib import blake2b
 from html import escape
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from urllib.parse import urljoin
 
-import aiohttp
 import asyncpg
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from pydantic import BaseModel
 
+from app.db import get_pg
+from app.lib.ttl_cache import TTLCache
+from app.services.http import get_session
 from app.services.sbc_solution_scraper import (
+    clear_caches,
     list_sbc_player_slugs,
     parse_sbc_page,
     parse_solution_players,
+    parse_solution_players_batch,
     normalize_version_id,
 )
 
@@ -25,6 +31,37 @@ except Exception:
     async def get_player_price(player_id: int, platform: str = "ps") -> Optional[int]:
         return None
 
+try:
+    from app.services.prices import get_player_prices  # (player_ids, platform) -> {player_id: int}
+except Exception:
+    async def get_player_prices(player_ids: List[int], platform: str = "ps") -> Dict[int, Optional[int]]:
+        prices = await asyncio.gather(*[get_player_price(pid, platform=platform) for pid in player_ids])
+        return dict(zip(player_ids, prices))
+
+# Prices move slowly next to a single render; misses (None) expire sooner so a
+# broken backend is retried without being hammered
+PRICE_TTL = 30.0
+PRICE_MISS_TTL = 5.0
+_PRICES = TTLCache(maxsize=10_000, ttl=PRICE_TTL)
+_MISSING = object()
+
+async def get_player_prices_cached(player_ids: List[int], platform: str = "ps") -> Dict[int, Optional[int]]:
+    out: Dict[int, Optional[int]] = {}
+    todo: List[int] = []
+    for pid in player_ids:
+        hit = _PRICES.get((pid, platform), _MISSING)
+        if hit is _MISSING:
+            todo.append(pid)
+        else:
+            out[pid] = hit
+    if todo:
+        fresh = await get_player_prices(todo, platform=platform)
+        for pid in todo:
+            price = fresh.get(pid)
+            _PRICES.set((pid, platform), price, ttl=PRICE_TTL if price is not None else PRICE_MISS_TTL)
+            out[pid] = price
+    return out
+
 router = APIRouter(prefix="/api/sbc2", tags=["SBC2"])
 
 # ---------- DB ----------
@@ -50,14 +87,33 @@ CREATE TABLE IF NOT EXISTS sbc_challenge_players (
 );
 """
 
-async def get_pool() -> asyncpg.Pool:
-    dsn = os.environ.get("DATABASE_URL")
-    if not dsn:
-        raise RuntimeError("DATABASE_URL not set")
-    return await asyncpg.create_pool(dsn, min_size=1, max_size=5)
+# fut_players isn't ours: its card_id indexes are an opt-in migration
+# (POST /ingest/index-fut-players), never part of SCHEMA_SQL. CONCURRENTLY keeps
+# writes flowing during the build but can't run inside a transaction, so one statement each.
+# Card lookups compare card_id::text (render) or card_id itself (html ingest).
+FUT_PLAYERS_INDEX_SQL = (
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS fut_players_card_id_text_idx ON fut_players ((card_id::text))",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_fut_players_card_id ON fut_players (card_id)",
+    "ANALYZE fut_players",
+)
+
+# Ingest statements; module constants so every call hits the same cached statement
+SQL_UPSERT_SET = (
+    "INSERT INTO sbc_sets (slug,title) VALUES ($1,$2) "
+    "ON CONFLICT (slug) DO UPDATE SET title=$2"
+)
+SQL_UPSERT_CHALLENGE = """INSERT INTO sbc_challenges (set_slug,name,coin_text,block_text,view_solution_url)
+VALUES ($1,$2,$3,$4,$5)
+ON CONFLICT (set_slug,name) DO UPDATE
+  SET coin_text=$3, block_text=$4, view_solution_url=$5"""
+SQL_CHALLENGE_IDS = "SELECT id, name FROM sbc_challenges WHERE set_slug=$1"
+SQL_INSERT_PLAYER = """INSERT INTO sbc_challenge_players (challenge_id,variant_code,name)
+VALUES ($1,$2,$3)
+ON CONFLICT (challenge_id,variant_code) DO NOTHING"""
 
 def format_coins(n: Optional[int]) -> str:
-    return "—" if n is None else f"{n:,}c"
+    """'—' or digits/commas + 'c' -- never needs HTML escaping."""
+    return "—" if n is None else f"{int(n):,}c"
 
 async def lookup_player_by_card_id(con: asyncpg.Connection, version_code: str) -> tuple[Optional[int], Optional[str]]:
     v = normalize_version_id(version_code)
@@ -69,6 +125,22 @@ async def lookup_player_by_card_id(con: asyncpg.Connection, version_code: str) -
     name = row.get("name") or row.get("full_name") or row.get("common_name")
     return row["id"], name
 
+async def lookup_players_by_card_ids(
+    con: asyncpg.Connection, card_ids: List[str]
+) -> Dict[str, tuple[int, Optional[str]]]:
+    """Resolve many already-normalized card ids in one query -> {card_id: (player_id, name)}."""
+    codes = [c for c in card_ids if c]
+    if not codes:
+        return {}
+    rows = await con.fetch(
+        "SELECT id, card_id::text AS cid, name FROM fut_players WHERE card_id::text = ANY($1::text[])",
+        codes,
+    )
+    found: Dict[str, tuple[int, Optional[str]]] = {}
+    for r in rows:
+        found.setdefault(r["cid"], (r["id"], r["name"]))
+    return found
+
 # 4-3-3-ish layout
 DEFAULT_SLOTS = [
     (50, 92),  # GK
@@ -76,90 +148,173 @@ DEFAULT_SLOTS = [
     (30, 58), (50, 56), (70, 58),            # CM, CM, CM
     (25, 36), (50, 32), (75, 36),            # LW, ST, RW
 ]
+# one position per rendered card, padded so render loops can index without a bounds check
+SLOTS = DEFAULT_SLOTS + [(50, 50)] * (11 - len(DEFAULT_SLOTS))
+
+# Static part of the pitch page, built once at import
+_PITCH_CSS = """<style>
+body{font-family:system-ui,-apple-system,Segoe UI,Roboto,sans-serif;background:#0a1a0a;color:#fff;margin:0}
+.wrap{max-width:1080px;margin:0 auto;padding:16px}
+h1{font-size:20px;margin:0 0 8px}
+.subtitle{opacity:.8;margin-bottom:16px}
+.pitch{position:relative;width:100%;padding-top:62%;
+  background:linear-gradient(#0f4d0f,#0b390b);border:2px solid #1f5f1f;border-radius:16px;
+  box-shadow:0 10px 30px rgba(0,0,0,.3);margin-bottom:16px}
+.slot{position:absolute;width:12%;transform:translate(-50%,-50%);text-align:center}
+.card{background:rgba(0,0,0,.25);border:1px solid rgba(255,255,255,.15);border-radius:12px;padding:6px 6px 8px}
+.name{font-size:12px;line-height:1.2;margin-top:4px}
+.price{font-size:12px;opacity:.9}
+.total{font-weight:700;font-size:16px;margin-top:8px}
+</style>"""
+_PITCH_TAIL = "</div></body></html>"
+_SLOT_TPL = (
+    "<div class='slot' style='{pos}'><div class='card'><div class='price'>{price}</div>"
+    "<div class='name'>{name}</div></div></div>"
+)
+# inline style for each layout position, so a render only formats name/price
+_SLOT_POS = {(x, y): f"left:{x}%;top:{y}%;" for x, y in DEFAULT_SLOTS + [(50, 50)]}
+
+def _slot_pos(x: Any, y: Any) -> str:
+    pos = _SLOT_POS.get((x, y))
+    return pos if pos is not None else f"left:{int(x)}%;top:{int(y)}%;"
 
 def _render_pitch_html(title: str, subtitle: str, cards: List[Dict[str, Any]], total_txt: str) -> str:
-    slots_html = "".join(
-        f"<div class='slot' style='left:{c['x']}%;top:{c['y']}%;'>"
-        f"<div class='card'><div class='price'>{escape(c['price_txt'])}</div>"
-        f"<div class='name'>{escape(c['name'])}</div></div></div>"
+    title_html = escape(title)
+    parts = [
+        f"<!doctype html>\n<html><head><meta charset='utf-8'><title>{title_html}</title>\n",
+        _PITCH_CSS,
+        f"</head><body><div class='wrap'>\n<h1>{title_html}</h1>\n"
+        f"<div class='subtitle'>{escape(subtitle)}</div>\n<div class='pitch'>\n",
+    ]
+    fmt = _SLOT_TPL.format
+    parts += [
+        fmt(pos=_slot_pos(c["x"], c["y"]), price=c["price_txt"], name=escape(c["name"]))
         for c in cards
-    )
-    return f"""<!doctype html>
-<html><head><meta charset='utf-8'><title>{escape(title)}</title>
-<style>
-body{{font-family:system-ui,-apple-system,Segoe UI,Roboto,sans-serif;background:#0a1a0a;color:#fff;margin:0}}
-.wrap{{max-width:1080px;margin:0 auto;padding:16px}}
-h1{{font-size:20px;margin:0 0 8px}}
-.subtitle{{opacity:.8;margin-bottom:16px}}
-.pitch{{position:relative;width:100%;padding-top:62%;
-  background:linear-gradient(#0f4d0f,#0b390b);border:2px solid #1f5f1f;border-radius:16px;
-  box-shadow:0 10px 30px rgba(0,0,0,.3);margin-bottom:16px}}
-.slot{{position:absolute;width:12%;transform:translate(-50%,-50%);text-align:center}}
-.card{{background:rgba(0,0,0,.25);border:1px solid rgba(255,255,255,.15);border-radius:12px;padding:6px 6px 8px}}
-.name{{font-size:12px;line-height:1.2;margin-top:4px}}
-.price{{font-size:12px;opacity:.9}}
-.total{{font-weight:700;font-size:16px;margin-top:8px}}
-</style></head><body><div class='wrap'>
-<h1>{escape(title)}</h1>
-<div class='subtitle'>{escape(subtitle)}</div>
-<div class='pitch'>
-{slots_html}
-</div>
-<div class='total'>Total: {escape(total_txt)}</div>
-</div></body></html>"""
+    ]
+    parts.append(f"\n</div>\n<div class='total'>Total: {total_txt}</div>\n")
+    parts.append(_PITCH_TAIL)
+    return "".join(parts)
+
+# ---------- Render cache ----------
+# A built pitch is reused for RENDER_CACHE_TTL seconds (0 disables it). The ETag is a
+# hash of the HTML itself, so a 304 only goes out while the client's copy is still current.
+RENDER_CACHE_TTL = max(0.0, float(os.getenv("RENDER_CACHE_TTL", "30")))
+_RENDERED = TTLCache(maxsize=256, ttl=RENDER_CACHE_TTL)
+
+def _etag_for(html: str) -> str:
+    return '"' + blake2b(html.encode("utf-8"), digest_size=16).hexdigest() + '"'
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag == etag or tag == "W/" + etag:
+            return True
+    return False
+
+async def _conditional_render(
+    request: Request, key: Tuple[Any, ...], build: Callable[[], Awaitable[str]]
+) -> Response:
+    """Serve the pitch from the render cache or build it; 304 if the client already has it."""
+    hit = _RENDERED.get(key)
+    if hit is None:
+        html = await build()
+        hit = (html, _etag_for(html))
+        _RENDERED.set(key, hit)
+    html, etag = hit
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={int(RENDER_CACHE_TTL)}"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=html, status_code=200, headers=headers)
 
 # ---------- Routes ----------
 @router.post("/ingest/init-schema")
 async def init_schema():
-    pool = await get_pool()
+    pool = await get_pg()
     async with pool.acquire() as con:
         await con.execute(SCHEMA_SQL)
-    await pool.close()
+    return {"ok": True}
+
+@router.post("/ingest/index-fut-players")
+async def index_fut_players():
+    pool = await get_pg()
+    async with pool.acquire() as con:
+        if await con.fetchval("SELECT to_regclass('public.fut_players')") is None:
+            return {"ok": False, "reason": "fut_players does not exist"}
+        try:
+            for sql in FUT_PLAYERS_INDEX_SQL:
+                await con.execute(sql)
+        except asyncpg.InsufficientPrivilegeError as e:
+            return JSONResponse(status_code=403, content={"error": str(e)})
     return {"ok": True}
 
 class IngestIn(BaseModel):
     limit: Optional[int] = None
 
+# Max concurrent fut.gg fetches during a bulk ingest
+INGEST_CONCURRENCY = int(os.getenv("INGEST_CONCURRENCY", "12"))
+
+async def _ingest_slug(s, pool: asyncpg.Pool, slug: str, sem: asyncio.Semaphore) -> None:
+    """Scrape one SBC set and its solution pages, then write it on a short-lived connection."""
+    async with sem:
+        entry = await parse_sbc_page(s, slug)
+
+    with_solution = [ch for ch in entry.challenges if ch.view_solution_url]
+    solutions = [
+        [{"name": "ERROR", "variant_code": f"solution_fetch_failed:{r}"}] if isinstance(r, BaseException) else r
+        for r in await parse_solution_players_batch(
+            s, [ch.view_solution_url for ch in with_solution], sem=sem, return_exceptions=True
+        )
+    ]
+
+    # pooled connections keep their statement cache, so these are parsed once per connection;
+    # one transaction per set means one commit instead of one per statement
+    async with pool.acquire() as con:
+        async with con.transaction():
+            await con.execute(SQL_UPSERT_SET, entry.slug, entry.title)
+            await con.executemany(
+                SQL_UPSERT_CHALLENGE,
+                [
+                    (entry.slug, ch.name, ch.coin_text, ch.block_text, ch.view_solution_url)
+                    for ch in entry.challenges
+                ],
+            )
+            ids = {r["name"]: r["id"] for r in await con.fetch(SQL_CHALLENGE_IDS, entry.slug)}
+
+            # one batch of player rows per set instead of one INSERT per player
+            player_rows = [
+                (ids[ch.name], normalize_version_id(p.get("variant_code")), p.get("name"))
+                for ch, players in zip(with_solution, solutions)
+                for p in players
+            ]
+            if player_rows:
+                await con.executemany(SQL_INSERT_PLAYER, player_rows)
+
 @router.post("/ingest-all")
 async def ingest_all(payload: IngestIn):
     try:
-        async with aiohttp.ClientSession() as s:
-            slugs = await list_sbc_player_slugs(s)
-            if payload.limit:
-                slugs = slugs[:payload.limit]
-
-            pool = await get_pool()
-            async with pool.acquire() as con:
-                await con.execute(SCHEMA_SQL)
-                for slug in slugs:
-                    entry = await parse_sbc_page(s, slug)
-                    await con.execute(
-                        "INSERT INTO sbc_sets (slug,title) VALUES ($1,$2) "
-                        "ON CONFLICT (slug) DO UPDATE SET title=$2",
-                        entry.slug, entry.title
-                    )
-                    for ch in entry.challenges:
-                        cid = await con.fetchval(
-                            """INSERT INTO sbc_challenges (set_slug,name,coin_text,block_text,view_solution_url)
-                               VALUES ($1,$2,$3,$4,$5)
-                               ON CONFLICT (set_slug,name) DO UPDATE 
-                                 SET coin_text=$3, block_text=$4, view_solution_url=$5
-                               RETURNING id""",
-                            entry.slug, ch.name, ch.coin_text, ch.block_text, ch.view_solution_url
-                        )
-                        if ch.view_solution_url:
-                            try:
-                                players = await parse_solution_players(s, ch.view_solution_url)
-                            except Exception as e:
-                                players = [{"name": "ERROR", "variant_code": f"solution_fetch_failed:{e}"}]
-                            for p in players:
-                                await con.execute(
-                                    """INSERT INTO sbc_challenge_players (challenge_id,variant_code,name)
-                                       VALUES ($1,$2,$3)
-                                       ON CONFLICT (challenge_id,variant_code) DO NOTHING""",
-                                    cid, normalize_version_id(p.get("variant_code")), p.get("name")
-                                )
-        return {"ok": True, "ingested": len(slugs)}
+        s = await get_session()
+        slugs = await list_sbc_player_slugs(s)
+        if payload.limit:
+            slugs = slugs[:payload.limit]
+
+        pool = await get_pg()
+        async with pool.acquire() as con:
+            await con.execute(SCHEMA_SQL)
+
+        # every set is an independent fetch+write pipeline; the semaphore bounds fut.gg load
+        sem = asyncio.Semaphore(INGEST_CONCURRENCY)
+        results = await asyncio.gather(
+            *[_ingest_slug(s, pool, slug, sem) for slug in slugs],
+            return_exceptions=True,
+        )
+        errors = [
+            {"slug": slug, "error": str(r)}
+            for slug, r in zip(slugs, results)
+            if isinstance(r, Exception)
+        ]
+        return {"ok": True, "ingested": len(slugs) - len(errors), "errors": errors}
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
 
@@ -168,6 +323,10 @@ async def ingest_all(payload: IngestIn):
 async def init_schema_get():
     return await init_schema()
 
+@router.get("/ingest/index-fut-players")
+async def index_fut_players_get():
+    return await index_fut_players()
+
 @router.get("/ingest-all")
 async def ingest_all_get(limit: Optional[int] = None):
     return await ingest_all(IngestIn(limit=limit))
@@ -175,8 +334,8 @@ async def ingest_all_get(limit: Optional[int] = None):
 # Index + alias
 @router.get("/index")
 async def sbc_index(limit: Optional[int] = None):
-    async with aiohttp.ClientSession() as s:
-        slugs = await list_sbc_player_slugs(s)
+    s = await get_session()
+    slugs = await list_sbc_player_slugs(s)
     if limit:
         slugs = slugs[:limit]
     return {"count": len(slugs), "slugs": slugs}
@@ -188,8 +347,8 @@ async def sbc_index_alias(limit: Optional[int] = None):
 # Challenges + alias
 @router.get("/challenges/{path:path}")
 async def sbc_challenges(path: str):
-    async with aiohttp.ClientSession() as s:
-        entry = await parse_sbc_page(s, path)
+    s = await get_session()
+    entry = await parse_sbc_page(s, path)
     return {
         "slug": entry.slug,
         "title": entry.title,
@@ -212,8 +371,8 @@ async def sbc_challenges_alias(path: str):
 @router.get("/debug/solution-images")
 async def debug_solution_images(solution_url: str):
     solution_url = urljoin("https://www.fut.gg", solution_url)
-    async with aiohttp.ClientSession() as s:
-        players = await parse_solution_players(s, solution_url)
+    s = await get_session()
+    players = await parse_solution_players(s, solution_url)
     return {
         "count": len(players),
         "codes": [p["variant_code"] for p in players],
@@ -224,66 +383,93 @@ async def debug_solution_images(solution_url: str):
 # -------- Shared render core (image-only codes) --------
 async def _render_from_solution_url(solution_url: str, platform: str = "ps") -> str:
     solution_url = urljoin("https://www.fut.gg", solution_url)
-    async with aiohttp.ClientSession() as s:
-        players = await parse_solution_players(s, solution_url)
+    s = await get_session()
+    players = await parse_solution_players(s, solution_url)
 
     if not players:
         raise HTTPException(502, "Could not extract any players from the solution page (image parser).")
 
-    pool = await get_pool()
+    ordered = players[:11]
+    codes = [normalize_version_id(p.get("variant_code")) for p in ordered]
+    pool = await get_pg()
+    async with pool.acquire() as con:
+        by_cid = await lookup_players_by_card_ids(con, codes)
+    pids = list(dict.fromkeys(by_cid[c][0] for c in codes if c in by_cid))
+    prices = await get_player_prices_cached(pids, platform=platform) if pids else {}
+
     total = 0
+    any_price = False
     cards: List[Dict[str, Any]] = []
-    async with pool.acquire() as con:
-        ordered = players[:11]
-        for idx, p in enumerate(ordered):
-            code = normalize_version_id(p.get("variant_code"))
-            pid, dbname = await lookup_player_by_card_id(con, code)
-            price = await get_player_price(pid, platform=platform) if pid is not None else None
-            total += (price or 0)
-            name = (p.get("name") or dbname or f"#{code}")
-            price_txt = format_coins(price)
-            x, y = DEFAULT_SLOTS[idx] if idx < len(DEFAULT_SLOTS) else (50, 50)
-            cards.append({"x": x, "y": y, "name": name, "price_txt": price_txt})
-
-    total_txt = format_coins(total) if any(c["price_txt"] != "—" for c in cards) else "—"
-    html = _render_pitch_html("Solution Pitch", "", cards, total_txt)
-    return HTMLResponse(content=html, status_code=200)
+    for (x, y), p, code in zip(SLOTS, ordered, codes):
+        pid, dbname = by_cid.get(code, (None, None))
+        price = prices.get(pid) if pid is not None else None
+        if price is not None:
+            total += price
+            any_price = True
+        name = (p.get("name") or dbname or f"#{code}")
+        cards.append({"x": x, "y": y, "name": name, "price_txt": format_coins(price)})
+
+    total_txt = format_coins(total) if any_price else "—"
+    return _render_pitch_html("Solution Pitch", "", cards, total_txt)
 
 # Render by SBC slug + challenge name
 @router.get("/render", response_class=HTMLResponse)
-async def render_pitch(slug: str, challenge: str, platform: str = "ps"):
-    async with aiohttp.ClientSession() as s:
-        entry = await parse_sbc_page(s, slug)
+async def render_pitch(request: Request, slug: str, challenge: str, platform: str = "ps"):
+    return await _conditional_render(
+        request,
+        ("sbc", slug, challenge.lower().strip(), platform),
+        lambda: _render_for_challenge(slug, challenge, platform),
+    )
+
+async def _render_for_challenge(slug: str, challenge: str, platform: str) -> str:
+    s = await get_session()
+    entry = await parse_sbc_page(s, slug)
+
+    # name -> challenge, preferring the first one that has a solution link
+    by_name: Dict[str, Any] = {}
+    for c in entry.challenges:
+        key = c.name.lower().strip()
+        if key not in by_name or (c.view_solution_url and not by_name[key].view_solution_url):
+            by_name[key] = c
+
+    chall = by_name.get(challenge.lower().strip())
+    if not chall or not chall.view_solution_url:
+        any_with_link = next((c for c in entry.challenges if c.view_solution_url), None)
+        if any_with_link:
+            chall = any_with_link
 
-        wanted = challenge.lower().strip()
-        chall = next((c for c in entry.challenges if c.name.lower().strip() == wanted and c.view_solution_url), None)
-        if not chall:
-            chall = next((c for c in entry.challenges if c.name.lower().strip() == wanted), None)
-        if chall and not chall.view_solution_url:
-            twin = next((c for c in entry.challenges if c.name.lower().strip() == wanted and c.view_solution_url), None)
-            if twin:
-                chall = twin
-        if not chall or not chall.view_solution_url:
-            any_with_link = next((c for c in entry.challenges if c.view_solution_url), None)
-            if any_with_link:
-                chall = any_with_link
-
-        if not chall:
-            raise HTTPException(404, f"Challenge '{challenge}' not found")
-        if not chall.view_solution_url:
-            raise HTTPException(404, "No View Solution URL on this challenge")
-
-        return await _render_from_solution_url(chall.view_solution_url, platform=platform)
+    if not chall:
+        raise HTTPException(404, f"Challenge '{challenge}' not found")
+    if not chall.view_solution_url:
+        raise HTTPException(404, "No View Solution URL on this challenge")
+
+    return await _render_from_solution_url(chall.view_solution_url, platform=platform)
 
 # Render directly from a squad-builder URL (accepts relative or absolute)
 @router.get("/render-by-url", response_class=HTMLResponse)
-async def render_by_url(solution_url: str = Query(...), platform: str = "ps"):
-    return await _render_from_solution_url(solution_url, platform=platform)
+async def render_by_url(request: Request, solution_url: str = Query(...), platform: str = "ps"):
+    return await _conditional_render(
+        request,
+        ("url", urljoin("https://www.fut.gg", solution_url), platform),
+        lambda: _render_from_solution_url(solution_url, platform=platform),
+    )
+
+# Drop cached fut.gg pages / parse results (e.g. right after a new SBC drops)
+@router.post("/cache/bust")
+async def cache_bust():
+    dropped = clear_caches()
+    dropped["rendered"] = len(_RENDERED)
+    _RENDERED.clear()
+    return {"ok": True, "dropped": dropped}
+
+@router.post("/cache/purge")
+async def cache_purge():
+    return await cache_bust()
 
 # Optional: schema peek
 @router.get("/debug/schema")
 async def debug_schema():
-    pool = await get_pool()
+    pool = await get_pg()
     async with pool.acquire() as con:
         async def cols(table):
             rows = await con.fetch(
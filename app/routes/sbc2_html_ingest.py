@@ -2,24 +2,12 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, HttpUrl
 from typing import List, Optional
-import asyncpg
-import os
 
+from app.db import get_pg
 from app.lib.sbc2_extract import extract_player_codes_from_html
 
 router = APIRouter(prefix="/api/sbc2/html", tags=["sbc2-html"])
 
-_DB_POOL = None
-
-async def get_pool() -> asyncpg.pool.Pool:
-    global _DB_POOL
-    if _DB_POOL is None:
-        dsn = os.getenv("DATABASE_URL")
-        if not dsn:
-            raise RuntimeError("DATABASE_URL not set")
-        _DB_POOL = await asyncpg.create_pool(dsn, min_size=1, max_size=5)
-    return _DB_POOL
-
 class IngestCodesReq(BaseModel):
     solution_url: HttpUrl
     html: str
@@ -41,7 +29,7 @@ async def ingest_codes(req: IngestCodesReq):
     if not codes:
         return IngestCodesResp(codes=[], found=[], matched=0)
 
-    pool = await get_pool()
+    pool = await get_pg()
 
     # First try as text (works whether DB column is text or numeric, thanks to cast)
     rows = []
@@ -1,11 +1,19 @@
 from __future__ import annotations
 import asyncio
-from typing import Optional
-from playwright.async_api import async_playwright, Browser
+import os
+from typing import List, Optional
+from playwright.async_api import async_playwright, Browser, BrowserContext, Route
 
 _browser: Optional[Browser] = None
 _lock = asyncio.Lock()
 
+# ---------- context pool ----------
+CONTEXT_POOL_SIZE = int(os.getenv("BROWSER_CONTEXTS", "4"))
+_BLOCKED_RESOURCES = frozenset({"image", "font", "stylesheet", "media"})
+
+_idle: Optional["asyncio.Queue[BrowserContext]"] = None
+_contexts: List[BrowserContext] = []
+
 async def get_browser() -> Browser:
     """
     Lazy-start a single shared headless Chromium instance.
@@ -26,8 +34,74 @@ async def get_browser() -> Browser:
             setattr(_browser, "_pw", pw)
     return _browser
 
+async def _block_heavy(route: Route) -> None:
+    if route.request.resource_type in _BLOCKED_RESOURCES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def get_context() -> BrowserContext:
+    """
+    Borrow a pooled BrowserContext (images/fonts/CSS/media blocked).
+    Contexts are created on demand up to CONTEXT_POOL_SIZE; after that
+    callers wait for one to be released. Pair with release_context().
+    """
+    global _idle
+    browser = await get_browser()
+    async with _lock:
+        if _idle is None:
+            _idle = asyncio.Queue(maxsize=CONTEXT_POOL_SIZE)
+        if _idle.empty() and len(_contexts) < CONTEXT_POOL_SIZE:
+            ctx = await browser.new_context()
+            await ctx.route("**/*", _block_heavy)
+            _contexts.append(ctx)
+            return ctx
+    return await _idle.get()
+
+async def release_context(ctx: BrowserContext) -> None:
+    """Drop cookies and any open pages, then return the context to the pool."""
+    if ctx not in _contexts or _idle is None:
+        return
+    try:
+        for page in list(ctx.pages):
+            await page.close()
+        await ctx.clear_cookies()
+    except Exception:
+        # a broken context is replaced so waiters in get_context() aren't starved
+        _contexts.remove(ctx)
+        browser = await get_browser()
+        ctx = await browser.new_context()
+        await ctx.route("**/*", _block_heavy)
+        _contexts.append(ctx)
+    _idle.put_nowait(ctx)
+
+async def fetch_html_via_browser(url: str, timeout_ms: int = 45000) -> str:
+    """Render `url` in a pooled context and return the page HTML."""
+    ctx = await get_context()
+    try:
+        page = await ctx.new_page()
+        # the SBC data is in the initial HTML; no need to wait for the load event
+        await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+        html = await page.content()
+        if "cf-chl" in html:
+            # still on the bot challenge: wait for it to hand over to the real page
+            await page.wait_for_function(
+                "() => !document.documentElement.outerHTML.includes('cf-chl')", timeout=timeout_ms
+            )
+            html = await page.content()
+        return html
+    finally:
+        await release_context(ctx)
+
 async def shutdown_browser() -> None:
-    global _browser
+    global _browser, _idle
+    for ctx in _contexts:
+        try:
+            await ctx.close()
+        except Exception:
+            pass
+    _contexts.clear()
+    _idle = None
     if _browser:
         pw = getattr(_browser, "_pw", None)
         await _browser.close()
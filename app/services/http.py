@@ -0,0 +1,41 @@
+from __future__ import annotations
+import asyncio
+from typing import Optional
+
+import aiohttp
+
+_session: Optional[aiohttp.ClientSession] = None
+_lock = asyncio.Lock()
+
+async def get_session() -> aiohttp.ClientSession:
+    """
+    Lazy-create a single shared aiohttp session so fut.gg requests reuse
+    keep-alive connections and cached DNS across API calls.
+    """
+    global _session
+    async with _lock:
+        if _session is None or _session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=64,
+                limit_per_host=16,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+                enable_cleanup_closed=True,
+            )
+            _session = aiohttp.ClientSession(connector=connector)
+    return _session
+
+async def warm_up(url: str = "https://www.fut.gg/") -> None:
+    """
+    HEAD fut.gg once so DNS is cached and a TLS connection is already in the
+    keep-alive pool before the first real scrape.
+    """
+    session = await get_session()
+    async with session.head(url, timeout=aiohttp.ClientTimeout(total=5)):
+        pass
+
+async def close_session() -> None:
+    global _session
+    if _session:
+        await _session.close()
+        _session = None
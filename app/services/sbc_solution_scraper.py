@@ -1,29 +1,180 @@
 from __future__ import annotations
 
+import asyncio
+import multiprocessing
+import os
+import random
 import re
-from dataclasses import dataclass
-from typing import List, Optional, Dict
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from html import unescape
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
 import aiohttp
-from bs4 import BeautifulSoup
+import lxml.html
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.element import CData, NavigableString, Tag
+from lxml import etree
+
+from app.lib.ttl_cache import TTLCache
+from app.services.http import get_session
 
 FUTGG_BASE = "https://www.fut.gg"
 
 # ---------- Models ----------
-@dataclass
+@dataclass(slots=True)
 class ChallengeBlock:
     name: str
     coin_text: Optional[str]
     block_text: str
     view_solution_url: Optional[str]
 
-@dataclass
+@dataclass(slots=True)
 class SbcEntry:
     slug: str
     title: str
     challenges: List[ChallengeBlock]
 
+# ---------- HTTP limits ----------
+# Cap in-flight fut.gg requests process-wide and retry rate limits / gateway errors.
+FUTGG_CONCURRENCY = int(os.getenv("FUTGG_CONC", "16"))
+FETCH_RETRIES = 3
+_RETRY_STATUSES = {429, 502, 503, 504}
+_FETCH_SEM = asyncio.BoundedSemaphore(FUTGG_CONCURRENCY)
+
+# Same for every request; conditional headers go on a copy. Accept-Encoding is
+# left to aiohttp, which adds br (and zstd) when it can decode them.
+_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-GB,en;q=0.9",
+    "Referer": "https://www.fut.gg/sbc/",
+    "Cache-Control": "no-cache",
+    "Pragma": "no-cache",
+    "Connection": "keep-alive",
+}
+_TIMEOUT = aiohttp.ClientTimeout(total=35, connect=15, sock_connect=15, sock_read=30)
+
+# ---------- HTTP cache ----------
+# Pages younger than the TTL are served from memory; older ones are revalidated
+# with If-None-Match / If-Modified-Since so an unchanged page costs a 304.
+PAGE_CACHE_TTL = float(os.getenv("FUTGG_CACHE_TTL", "600"))
+PAGE_CACHE_MAX = 512
+# pages run to hundreds of KB, so the entry cap alone could hold hundreds of MB;
+# least recently used pages go first once the bodies add up to this many bytes
+PAGE_CACHE_MAX_BYTES = int(os.getenv("FUTGG_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+@dataclass
+class _CachedPage:
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+    # last parse of this body per kind; a 304 keeps the same page object, so the old
+    # result is still right, and it goes away with the page when the LRU evicts it
+    parsed: Dict[str, Any] = field(default_factory=dict)
+
+_PAGE_CACHE: "OrderedDict[str, _CachedPage]" = OrderedDict()
+_PAGE_CACHE_BYTES = 0  # sum of len(body) over _PAGE_CACHE
+_INFLIGHT: Dict[str, "asyncio.Future[bytes]"] = {}
+
+def _remember_page(url: str, page: _CachedPage) -> None:
+    global _PAGE_CACHE_BYTES
+    old = _PAGE_CACHE.get(url)
+    if old is not None:
+        _PAGE_CACHE_BYTES -= len(old.body)
+    _PAGE_CACHE[url] = page
+    _PAGE_CACHE.move_to_end(url)
+    _PAGE_CACHE_BYTES += len(page.body)
+    while _PAGE_CACHE and (len(_PAGE_CACHE) > PAGE_CACHE_MAX or _PAGE_CACHE_BYTES > PAGE_CACHE_MAX_BYTES):
+        _PAGE_CACHE_BYTES -= len(_PAGE_CACHE.popitem(last=False)[1].body)
+
+# Parsed results (SbcEntry / player lists) keyed by (kind, url); callers must not mutate them
+PARSE_CACHE_TTL = float(os.getenv("FUTGG_PARSE_TTL", "300"))
+_PARSED = TTLCache(maxsize=1024, ttl=PARSE_CACHE_TTL)
+INDEX_CACHE_TTL = float(os.getenv("FUTGG_INDEX_TTL", "60"))
+
+def _parsed_for_body(key: Tuple[str, str], body: bytes):
+    kind, url = key
+    page = _PAGE_CACHE.get(url)
+    return page.parsed.get(kind) if page is not None and page.body is body else None
+
+def _remember_body_parse(key: Tuple[str, str], body: bytes, result) -> None:
+    kind, url = key
+    page = _PAGE_CACHE.get(url)
+    if page is not None and page.body is body:
+        page.parsed[kind] = result
+
+def _remember_parsed(key: Tuple[str, str], body: bytes, result) -> None:
+    _PARSED.set(key, result)
+    _remember_body_parse(key, body, result)
+
+# ---------- Browser fallback ----------
+# Only a Cloudflare-marked 403/503 or a small challenge page sends a fetch to
+# Playwright; hosts it got through skip the plain GET probe for a while.
+_CHALLENGE_STATUSES = {403, 503}
+_CHALLENGE_MAX_BYTES = 5000
+BROWSER_HOST_TTL = float(os.getenv("FUTGG_BROWSER_HOST_TTL", "900"))
+_BROWSER_HOSTS = TTLCache(maxsize=64, ttl=BROWSER_HOST_TTL)
+# Opt-in last resort for solution pages whose plain HTML yields no players at all.
+# Off by default: a bulk ingest would start a Chromium render per empty page. When on,
+# renders are capped below the context pool so bot-challenge fetches still get one.
+SOLUTION_BROWSER_FALLBACK = os.getenv("FUTGG_SOLUTION_BROWSER", "0") == "1"
+_SOLUTION_RENDER_SEM = asyncio.BoundedSemaphore(int(os.getenv("FUTGG_SOLUTION_BROWSER_CONC", "2")))
+
+def clear_caches() -> Dict[str, int]:
+    """Drop every cached page and parse result; returns how many entries were dropped."""
+    global _PAGE_CACHE_BYTES
+    dropped = {"pages": len(_PAGE_CACHE), "parsed": len(_PARSED)}
+    _PAGE_CACHE.clear()
+    _PAGE_CACHE_BYTES = 0
+    _PARSED.clear()
+    return dropped
+
+# ---------- Parse offload ----------
+# Pages at least this large are parsed in worker processes so lxml/bs4 time
+# doesn't stall the event loop; smaller ones are cheaper to parse inline than to pickle.
+PARSE_OFFLOAD_BYTES = int(os.getenv("FUTGG_OFFLOAD_BYTES", "262144"))
+PARSE_WORKERS = int(os.getenv("FUTGG_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+_PARSE_POOL: Optional[ProcessPoolExecutor] = None
+
+def _parse_pool() -> ProcessPoolExecutor:
+    global _PARSE_POOL
+    if _PARSE_POOL is None:
+        # spawn, not fork: forking a process that runs an event loop and threads is unsafe
+        _PARSE_POOL = ProcessPoolExecutor(
+            max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _PARSE_POOL
+
+async def _parse_maybe_offloaded(fn, html: bytes, *args):
+    """fn(html, *args), in the worker pool when the page is large enough to be worth it."""
+    global _PARSE_POOL
+    if len(html) >= PARSE_OFFLOAD_BYTES:
+        pool = _parse_pool()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, fn, html, *args)
+        except BrokenProcessPool:
+            # a worker died (e.g. OOM): drop the dead pool so the next large page gets a fresh one
+            if _PARSE_POOL is pool:
+                _PARSE_POOL = None
+            pool.shutdown(wait=False, cancel_futures=True)
+    return fn(html, *args)
+
+def shutdown_parse_pool() -> None:
+    global _PARSE_POOL
+    if _PARSE_POOL is not None:
+        _PARSE_POOL.shutdown(wait=False, cancel_futures=True)
+        _PARSE_POOL = None
+
 # ---------- Regex ----------
 # coin text is optional here, kept for completeness
 _COINS_RE = re.compile(r"([\d,]+)\s*(?:Image:\s*)?(?:FC\s*Coin|Coins?)", re.IGNORECASE)
@@ -31,32 +182,162 @@ _COINS_RE = re.compile(r"([\d,]+)\s*(?:Image:\s*)?(?:FC\s*Coin|Coins?)", re.IGNO
 # image URL pattern: .../player-item/25-<digits>.<anything>.webp
 IMG_CARD_CODE_RE = re.compile(r"/player-item/25-(\d+)\.")  # capture digits after 25- up to the first dot
 
+# whole <img ...> tags, plus what must be skipped over rather than scanned: comments,
+# <script>/<style> bodies and every other start tag, whose quoted attribute values may
+# hold markup (bytes patterns: the solution page is scanned undecoded, only captures
+# get decoded). A quote only opens a value right after '='.
+_IMG_SCAN_RE = re.compile(
+    rb"""<!--.*?(?:-->|\Z)"""
+    rb"""|<(script|style)\b[^>]*>.*?(?:</\1\s*>|\Z)"""
+    rb"""|(<img(?=[\s/>])(?:[^>=]|=\s*"[^"]*"|=\s*'[^']*'|=(?!\s*["']))*>)"""
+    rb"""|<[A-Za-z][^\s/>]*(?:[^>=]|=\s*"[^"]*"|=\s*'[^']*'|=(?!\s*["']))*>""",
+    re.IGNORECASE | re.DOTALL,
+)
+# one attribute of a tag: name, then a double-, single- or unquoted value
+_ATTR_RE = re.compile(rb"""([^\s/>=][^\s/>=]*)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]*)))?""")
+
+_NON_DIGIT_RE = re.compile(r"\D")
+
+# last resort when no <img> survives: player-item URLs inside the Next.js payload
+_NEXT_DATA_RE = re.compile(
+    rb"""<script\b[^>]*\bid\s*=\s*["']__NEXT_DATA__["'][^>]*>(.*?)</script>""", re.IGNORECASE | re.DOTALL
+)
+_JSON_PLAYER_IMG_RE = re.compile(r'"([^"]*?/player-item/25-\d+\.[^"]*?)"')
+
+# solution fallback only needs <img src>; skip building every other tag
+_IMG_STRAINER = SoupStrainer("img", src=True)
+
+# index page: player-SBC hrefs in one libxml2 walk (comments and scripts aren't elements)
+_XP_SBC_PLAYER_HREFS = etree.XPath('//a[contains(@href, "/sbc/players/")]/@href')
+
 # ---------- Utils ----------
 def normalize_version_id(code: str | int | None) -> str:
     """Digits only; strip leading zeros (so '000123' -> '123')."""
-    s = re.sub(r"\D", "", str(code or ""))
+    s = _NON_DIGIT_RE.sub("", str(code or ""))
     return s.lstrip("0") or s
 
+def _soup(html: bytes | str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    # lxml's C tree builder; html.parser is the slowest bs4 backend
+    return BeautifulSoup(html, "lxml", parse_only=parse_only)
+
 def _clean(s: str) -> str:
-    return re.sub(r"\s+", " ", s or "").strip()
-
-async def _fetch(session: aiohttp.ClientSession, url: str) -> str:
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-            "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
-        ),
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-        "Accept-Language": "en-GB,en;q=0.9",
-        "Referer": "https://www.fut.gg/sbc/",
-        "Cache-Control": "no-cache",
-        "Pragma": "no-cache",
-        "Connection": "keep-alive",
-    }
-    timeout = aiohttp.ClientTimeout(total=35, connect=15, sock_connect=15, sock_read=30)
-    async with session.get(url, headers=headers, timeout=timeout) as resp:
-        resp.raise_for_status()
-        return await resp.text()
+    # str.split() already collapses whitespace runs and trims the ends
+    return " ".join((s or "").split())
+
+def _abs(href: str) -> str:
+    """urljoin(FUTGG_BASE, href) for the shapes fut.gg emits, without parsing either URL."""
+    if href.startswith("/") and "/." not in href:
+        return "https:" + href if href.startswith("//") else FUTGG_BASE + href
+    if href.startswith(("https://", "http://")):
+        return href
+    return urljoin(FUTGG_BASE, href)  # dot segments, bare relatives, stray whitespace
+
+def _text(b: bytes) -> str:
+    """Decode a captured attribute value and resolve its HTML entities."""
+    return unescape(b.decode("utf-8", "replace"))
+
+def _retry_delay(retry_after: Optional[str], attempt: int) -> float:
+    """Honor a numeric Retry-After, else exponential backoff with jitter (capped at 30s)."""
+    if retry_after and retry_after.strip().isdigit():
+        return min(float(retry_after), 60.0)
+    return min(2 ** attempt, 30) + random.random()
+
+async def _fetch_via_browser(url: str) -> bytes:
+    try:
+        from app.services.browser import fetch_html_via_browser
+    except ImportError as e:
+        raise RuntimeError(f"{url} served a bot challenge and Playwright is unavailable: {e}")
+    body = (await fetch_html_via_browser(url)).encode("utf-8")
+    _remember_page(url, _CachedPage(body=body, etag=None, last_modified=None, fetched_at=time.monotonic()))
+    return body
+
+def _is_challenge_page(body: bytes) -> bool:
+    return len(body) < _CHALLENGE_MAX_BYTES and b"cf-chl" in body
+
+async def _is_challenge_response(resp: aiohttp.ClientResponse) -> bool:
+    """A 403/503 only counts as bot protection when Cloudflare marks it as one."""
+    if resp.headers.get("cf-mitigated", "").lower() == "challenge":
+        return True
+    return b"cf-chl" in await resp.read()
+
+def _fetch_done(url: str):
+    def done(task: "asyncio.Future[bytes]") -> None:
+        _INFLIGHT.pop(url, None)
+        if not task.cancelled():
+            task.exception()  # retrieved here so an orphaned failure isn't logged as unhandled
+    return done
+
+async def _fetch(
+    session: Optional[aiohttp.ClientSession], url: str, max_age: float = PAGE_CACHE_TTL
+) -> bytes:
+    """
+    GET a fut.gg page and return the raw (already gzip/deflate-decoded) body.
+    Bytes go straight into lxml; decode only where a str is really needed.
+    Falls back to a headless browser only when the GET hits bot protection.
+    A cached copy older than max_age seconds is revalidated first.
+    session=None uses the app-wide shared session.
+    """
+    now = time.monotonic()
+    cached = _PAGE_CACHE.get(url)
+    if cached and now - cached.fetched_at < max_age:
+        _PAGE_CACHE.move_to_end(url)
+        return cached.body
+
+    # concurrent misses for one URL share a single request
+    task = _INFLIGHT.get(url)
+    if task is None:
+        if session is None:
+            session = await get_session()
+            task = _INFLIGHT.get(url)  # may have been started while we waited
+    if task is None:
+        task = asyncio.ensure_future(_fetch_uncached(session, url, cached))
+        _INFLIGHT[url] = task
+        task.add_done_callback(_fetch_done(url))
+    # shield: a cancelled caller must not cancel the fetch the others are waiting on
+    return await asyncio.shield(task)
+
+async def _fetch_uncached(session: aiohttp.ClientSession, url: str, cached: Optional[_CachedPage]) -> bytes:
+    if _BROWSER_HOSTS.get(urlparse(url).netloc):
+        return await _fetch_via_browser(url)
+
+    headers = _HEADERS
+    if cached and (cached.etag or cached.last_modified):
+        headers = dict(_HEADERS)
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+    timeout = _TIMEOUT
+    for attempt in range(FETCH_RETRIES + 1):
+        async with _FETCH_SEM:
+            async with session.get(url, headers=headers, timeout=timeout) as resp:
+                if resp.status == 304 and cached:
+                    cached.fetched_at = time.monotonic()
+                    _remember_page(url, cached)
+                    return cached.body
+                if resp.status not in _RETRY_STATUSES or attempt == FETCH_RETRIES:
+                    if resp.status in _CHALLENGE_STATUSES and await _is_challenge_response(resp):
+                        break
+                    resp.raise_for_status()
+                    body = await resp.read()
+                    if _is_challenge_page(body):
+                        break
+                    _remember_page(url, _CachedPage(
+                        body=body,
+                        etag=resp.headers.get("ETag"),
+                        last_modified=resp.headers.get("Last-Modified"),
+                        fetched_at=time.monotonic(),
+                    ))
+                    return body
+                delay = _retry_delay(resp.headers.get("Retry-After"), attempt)
+        # back off outside the semaphore so other fetches keep flowing
+        await asyncio.sleep(delay)
+    # only reached by a `break` above: the plain GET hit a challenge. The host is flagged
+    # once the browser got through; browser-only fetches don't renew the flag, so once
+    # it lapses the next miss probes with a plain GET again.
+    body = await _fetch_via_browser(url)
+    _BROWSER_HOSTS.set(urlparse(url).netloc, True)
+    return body
 
 def _is_view_solution_anchor(a) -> bool:
     if not a or not a.has_attr("href"):
@@ -64,40 +345,67 @@ def _is_view_solution_anchor(a) -> bool:
     href = a["href"] or ""
     if "/squad-builder/" in href:
         return True
-    txt = (a.get_text(" ", strip=True) or "").lower()
-    if "view solution" in txt:
-        return True
-    for sp in a.find_all("span"):
-        if "view solution" in (sp.get_text(" ", strip=True) or "").lower():
-            return True
-    return False
+    # get_text already descends into child <span>s, so one check covers them
+    return "view solution" in (a.get_text(" ", strip=True) or "").lower()
+
+_SECTION_TEXT_TAGS = frozenset({"p", "li", "div", "span", "strong", "em", "ul", "ol"})
+_TEXT_STRING_TYPES = (NavigableString, CData)  # what get_text() counts as text
 
 # ---------- SBC index & page parsing ----------
-async def list_sbc_player_slugs(session: aiohttp.ClientSession, index_url: str = f"{FUTGG_BASE}/sbc/") -> List[str]:
-    html = await _fetch(session, index_url)
-    soup = BeautifulSoup(html, "html.parser")
-    slugs: List[str] = []
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-        if "/sbc/players/" in href:
+async def list_sbc_player_slugs(session: Optional[aiohttp.ClientSession], index_url: str = f"{FUTGG_BASE}/sbc/") -> List[str]:
+    key = ("index", index_url)
+    cached = _PARSED.get(key)
+    if cached is not None:
+        return cached
+    # callers poll the index; a short max-age keeps new SBCs showing up quickly
+    html = await _fetch(session, index_url, max_age=INDEX_CACHE_TTL)
+    cached = _parsed_for_body(key, html)
+    if cached is None:
+        slugs: List[str] = []
+        try:
+            hrefs = _XP_SBC_PLAYER_HREFS(lxml.html.fromstring(html))
+        except etree.ParserError:
+            hrefs = []  # nothing but whitespace / comments, e.g. a maintenance page
+        for href in hrefs:
             try:
                 slugs.append(href.split("/sbc/")[1].strip("/"))
             except Exception:
                 pass
-    # de-dup preserve order
-    out, seen = [], set()
-    for s in slugs:
-        if s not in seen:
-            out.append(s); seen.add(s)
-    return out
-
-async def parse_sbc_page(session: aiohttp.ClientSession, slug: str) -> SbcEntry:
+        # de-dup preserve order (dicts keep insertion order)
+        cached = list(dict.fromkeys(slugs))
+        _remember_body_parse(key, html, cached)
+    _PARSED.set(key, cached, ttl=INDEX_CACHE_TTL)
+    return cached
+
+async def parse_sbc_page(session: Optional[aiohttp.ClientSession], slug: str) -> SbcEntry:
     """
     Parse the SBC set page and find each challenge block and its 'View Solution' link.
     """
     url = slug if slug.startswith("http") else f"{FUTGG_BASE}/sbc/{slug}"
+    key = ("sbc", url)
+    cached = _PARSED.get(key)
+    if cached is not None:
+        return cached
     html = await _fetch(session, url)
-    soup = BeautifulSoup(html, "html.parser")
+    cached = _parsed_for_body(key, html)
+    if cached is not None:
+        _PARSED.set(key, cached)
+        return cached
+    entry = _intern_names(await _parse_maybe_offloaded(_parse_sbc_html, html, slug))
+    _remember_parsed(key, html, entry)
+    return entry
+
+def _intern_names(entry: SbcEntry) -> SbcEntry:
+    # titles and challenge names ("82 Rated Squad", ...) recur across sets and cached
+    # entries; interned here in this process, since a worker's interning doesn't survive pickling
+    entry.title = sys.intern(entry.title)
+    for c in entry.challenges:
+        c.name = sys.intern(c.name)
+    return entry
+
+def _parse_sbc_html(html: bytes, slug: str) -> SbcEntry:
+    """CPU half of parse_sbc_page; top-level so worker processes can run it."""
+    soup = _soup(html)
 
     title_el = soup.find("h1")
     title = title_el.get_text(strip=True) if title_el else "SBC"
@@ -105,32 +413,61 @@ async def parse_sbc_page(session: aiohttp.ClientSession, slug: str) -> SbcEntry:
     headers = soup.find_all(["h2", "h3", "h4", "h5"])
     challenges: List[ChallengeBlock] = []
 
-    for i, header in enumerate(headers):
-        name = header.get_text(" ", strip=True)
-        if name.strip().lower() == (title or "").strip().lower():
-            continue
+    # One walk over the document from the first header, splitting it into
+    # per-header sections, instead of restarting next_elements at every header.
+    # The walk also records every text string once; a text tag's get_text() is then
+    # the run of strings between entering and leaving it, so no subtree is re-walked.
+    section_runs: List[List[List[int]]] = [[] for _ in headers]  # [start, end) into strings, per text tag
+    section_link: List[Optional[str]] = [None] * len(headers)
+    strings: List[str] = []
+    if headers:
+        current, upcoming = 0, 1
+        open_tags: List[Tuple[Tag, Optional[List[int]]]] = []  # ancestors entered during the walk
 
-        next_header = headers[i + 1] if i + 1 < len(headers) else None
-        view_solution_url: Optional[str] = None
-        text_parts: List[str] = []
+        def close_until(parent) -> None:
+            while open_tags and open_tags[-1][0] is not parent:
+                run = open_tags.pop()[1]
+                if run is not None:
+                    run[1] = len(strings)
 
-        for node in header.next_elements:
-            if node is header:
+        for node in headers[0].next_elements:
+            close_until(node.parent)
+            if not isinstance(node, Tag):
+                if type(node) in _TEXT_STRING_TYPES:  # comments, script/style: get_text skips them too
+                    text = node.strip()
+                    if text:
+                        strings.append(text)
                 continue
-            if next_header is not None and node is next_header:
-                break
+            run = None
+            if upcoming < len(headers) and node is headers[upcoming]:
+                current, upcoming = upcoming, upcoming + 1
+            else:
+                nm = node.name
+                if nm in _SECTION_TEXT_TAGS:
+                    run = [len(strings), -1]
+                    section_runs[current].append(run)
+                elif nm == "a" and node.has_attr("href") and _is_view_solution_anchor(node):
+                    section_link[current] = _abs(node["href"])
+            open_tags.append((node, run))
+        close_until(None)
+
+    title_key = (title or "").strip().lower()
+    keys: List[str] = []  # lowercased name per challenge, reused by the dedupe below
+    for i, header in enumerate(headers):
+        name = header.get_text(" ", strip=True)
+        name_key = name.strip().lower()
+        if name_key == title_key:
+            continue
 
-            if getattr(node, "name", None) in {"p", "li", "div", "span", "strong", "em", "ul", "ol"}:
-                text_parts.append(node.get_text(" ", strip=True))
-            if getattr(node, "name", None) == "a" and node.has_attr("href"):
-                if _is_view_solution_anchor(node):
-                    view_solution_url = urljoin(FUTGG_BASE, node["href"])
+        view_solution_url = section_link[i]
+        text_parts = [" ".join(strings[start:end]) for start, end in section_runs[i]]
 
         block_text = _clean(" ".join(text_parts))
         m = _COINS_RE.search(block_text or "")
         coin_text = m.group(1) if m else None
 
-        if view_solution_url or "min." in (block_text or "").lower() or "rated squad" in (name or "").lower():
+        if view_solution_url or "min." in (block_text or "").lower() or "rated squad" in name_key:
+            keys.append(name_key)
             challenges.append(
                 ChallengeBlock(
                     name=name,
@@ -142,20 +479,22 @@ async def parse_sbc_page(session: aiohttp.ClientSession, slug: str) -> SbcEntry:
 
     # Fallback: map any global /squad-builder/ anchor to nearest header
     if not any(c.view_solution_url for c in challenges):
+        by_name: Dict[str, List[ChallengeBlock]] = {}
+        for c in challenges:
+            by_name.setdefault(c.name, []).append(c)
         for a in soup.find_all("a", href=True):
             if _is_view_solution_anchor(a):
                 prev_header = a.find_previous(["h2", "h3", "h4", "h5"])
                 if prev_header:
                     target = prev_header.get_text(" ", strip=True)
-                    for c in challenges:
-                        if c.name == target and not c.view_solution_url:
-                            c.view_solution_url = urljoin(FUTGG_BASE, a["href"])
+                    for c in by_name.get(target, ()):
+                        if not c.view_solution_url:
+                            c.view_solution_url = _abs(a["href"])
                             break
 
     # Prefer entries that have links when duplicates exist
     uniq: Dict[str, ChallengeBlock] = {}
-    for c in challenges:
-        k = c.name.lower().strip()
+    for k, c in zip(keys, challenges):
         if k not in uniq or (c.view_solution_url and not uniq[k].view_solution_url):
             uniq[k] = c
     challenges = list(uniq.values())
@@ -163,43 +502,151 @@ async def parse_sbc_page(session: aiohttp.ClientSession, slug: str) -> SbcEntry:
     return SbcEntry(slug=slug.strip("/"), title=title, challenges=challenges)
 
 # ---------- Solution page -> players (IMAGE-ONLY) ----------
-async def parse_solution_players(session: aiohttp.ClientSession, solution_url: str) -> List[Dict[str, str]]:
-    """
-    Extract players by scanning IMG URLs only:
-      https://game-assets.fut.gg/.../player-item/25-<digits>.<hash>.webp
-    Return list of dicts: { variant_code: <digits>, image_url: <src>, name: <alt if present> }
-    """
-    solution_url = urljoin(FUTGG_BASE, solution_url)
-    html = await _fetch(session, solution_url)
-    soup = BeautifulSoup(html, "html.parser")
-
+def _collect_player_images(images: Iterable[Tuple[str, str]], solution_url: str) -> List[Dict[str, str]]:
+    """(src, alt) pairs in DOM order -> the first XI of unique player-item cards."""
     results: List[Dict[str, str]] = []
     seen_codes = set()
+    origin: Optional[str] = None  # scheme://host of the solution page, parsed on first relative src
+    card_code = IMG_CARD_CODE_RE.search  # bound once; called per candidate image
 
-    # iterate visible <img> tags in DOM order
-    for img in soup.find_all("img", src=True):
-        src: str = img["src"]
+    for src, alt in images:
         # Only consider player-item images (handle absolute or relative, cf transform doesn't matter)
         if "/player-item/" not in src:
             continue
-        m = IMG_CARD_CODE_RE.search(src)
+        m = card_code(src)
         if not m:
             continue
-        code = normalize_version_id(m.group(1))
-        if not code or code in seen_codes:
+        # the group is already digits, so normalizing is just the zero strip
+        digits = m.group(1)
+        code = digits.lstrip("0") or digits
+        if code in seen_codes:
             continue
         seen_codes.add(code)
-        alt = (img.get("alt") or "").strip()
+        alt = (alt or "").strip()
         # normalize absolute URL if needed
         if src.startswith("//"):
             src = "https:" + src
         elif src.startswith("/"):
             # keep the same host as the solution page
-            p = urlparse(solution_url)
-            src = f"{p.scheme}://{p.netloc}{src}"
+            if origin is None:
+                p = urlparse(solution_url)
+                origin = f"{p.scheme}://{p.netloc}"
+            src = origin + src
         results.append({"variant_code": code, "image_url": src, "name": alt})
 
         if len(results) >= 11:  # we only need first XI
             break
 
     return results
+
+def _img_attrs(tag: bytes) -> Dict[bytes, bytes]:
+    """Attributes of one <img ...> tag; a repeated name keeps its first value, as lxml does."""
+    attrs: Dict[bytes, bytes] = {}
+    for m in _ATTR_RE.finditer(tag, 4, len(tag) - 1):
+        name = m.group(1).lower()
+        if name not in attrs:
+            value = m.group(2)
+            if value is None:
+                value = m.group(3)
+                if value is None:
+                    value = m.group(4) or b""
+            attrs[name] = value
+    return attrs
+
+def _scan_img_tags(html: bytes) -> Iterator[Tuple[str, str]]:
+    """Yield (src, alt) of player-item <img> tags straight from the raw bytes, no DOM or decode."""
+    for m in _IMG_SCAN_RE.finditer(html):
+        tag = m.group(2)
+        if tag is None or b"/player-item/" not in tag:
+            continue  # a comment, script / style body, other tag, or unrelated image
+        attrs = _img_attrs(tag)
+        src = attrs.get(b"src")
+        if src is None:
+            continue
+        yield _text(src), _text(attrs.get(b"alt", b""))
+
+def _parse_players_sync(html: bytes, solution_url: str) -> List[Dict[str, str]]:
+    """CPU half of parse_solution_players; top-level so worker processes can run it."""
+    # fast path: regex over the raw tags; build a DOM only if markup defeats it
+    results = _collect_player_images(_scan_img_tags(html), solution_url)
+    if not results:
+        soup = _soup(html, parse_only=_IMG_STRAINER)
+        results = _collect_player_images(
+            ((img["src"], img.get("alt") or "") for img in soup.find_all("img", src=True)),
+            solution_url,
+        )
+    if not results:
+        m = _NEXT_DATA_RE.search(html)
+        if m:
+            # JSON string values; only the escaped slash matters for a URL
+            payload = m.group(1).decode("utf-8", "replace").replace("\\/", "/")
+            results = _collect_player_images(
+                ((u, "") for u in _JSON_PLAYER_IMG_RE.findall(payload)), solution_url
+            )
+    return results
+
+async def parse_solution_players(session: Optional[aiohttp.ClientSession], solution_url: str) -> List[Dict[str, str]]:
+    """
+    Extract players by scanning IMG URLs only:
+      https://game-assets.fut.gg/.../player-item/25-<digits>.<hash>.webp
+    Return list of dicts: { variant_code: <digits>, image_url: <src>, name: <alt if present> }
+    """
+    solution_url = _abs(solution_url)
+    key = ("solution", solution_url)
+    cached = _PARSED.get(key)
+    if cached is not None:
+        return cached
+    html = await _fetch(session, solution_url)
+    cached = _parsed_for_body(key, html)
+    if cached is not None:
+        _PARSED.set(key, cached)
+        return cached
+    results = await _parse_maybe_offloaded(_parse_players_sync, html, solution_url)
+    if not results and SOLUTION_BROWSER_FALLBACK:
+        results = await _render_solution_players(solution_url)
+
+    _remember_parsed(key, html, results)
+    return results
+
+async def _render_solution_players(solution_url: str) -> List[Dict[str, str]]:
+    """Every HTTP path came up empty: render the page once in a browser and rescan it."""
+    try:
+        from app.services.browser import fetch_html_via_browser
+        async with _SOLUTION_RENDER_SEM:
+            html = await fetch_html_via_browser(solution_url)
+    except Exception:
+        # Playwright missing or the render failed; the caller reports "no players"
+        return []
+    # client-rendered pages are big; same offload rule as a fetched page
+    return await _parse_maybe_offloaded(_parse_players_sync, html.encode("utf-8"), solution_url)
+
+# ---------- Batch helpers ----------
+async def _gather_bounded(fn, session, items, concurrency, sem, return_exceptions):
+    sem = sem or asyncio.Semaphore(concurrency)
+
+    async def one(item):
+        async with sem:
+            return await fn(session, item)
+
+    return await asyncio.gather(*[one(i) for i in items], return_exceptions=return_exceptions)
+
+async def parse_solution_players_batch(
+    session: Optional[aiohttp.ClientSession],
+    urls: Iterable[str],
+    concurrency: int = 8,
+    sem: Optional[asyncio.Semaphore] = None,
+    return_exceptions: bool = False,
+) -> List[List[Dict[str, str]]]:
+    """parse_solution_players over many URLs concurrently, results in input order.
+    Pass `sem` to share one limit across several batches."""
+    return await _gather_bounded(parse_solution_players, session, urls, concurrency, sem, return_exceptions)
+
+async def parse_sbc_pages(
+    session: Optional[aiohttp.ClientSession],
+    slugs: Iterable[str],
+    concurrency: int = 8,
+    sem: Optional[asyncio.Semaphore] = None,
+    return_exceptions: bool = False,
+) -> List[SbcEntry]:
+    """parse_sbc_page over many slugs concurrently, results in input order."""
+    return await _gather_bounded(parse_sbc_page, session, slugs, concurrency, sem, return_exceptions)
@@ -1,10 +1,14 @@
 # main.py
 import os
+import sys
 import logging
 import importlib
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.db import close_pg, get_pg
+from app.services.http import close_session, warm_up
+
 # ---- app setup ----
 logger = logging.getLogger("uvicorn")
 logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
@@ -44,6 +48,33 @@ _include_router_safe("app.routes.sbc2_db_render")   # render/pitch endpoints
 _include_router_safe("app.routes.sbc2_ingest")      # ingest-all, init-schema, etc.
 _include_router_safe("app.routes.sbc2_debug")       # any debug endpoints you created
 
+# ---- lifecycle ----
+@app.on_event("startup")
+async def _startup():
+    # open the DB pool up front so the first request doesn't pay for it
+    if os.getenv("DATABASE_URL"):
+        try:
+            await get_pg()
+        except Exception as e:
+            logger.warning(f"DB pool not primed at startup -> {e}")
+    # same for the fut.gg connection: resolve and handshake before the first scrape
+    try:
+        await warm_up()
+    except Exception as e:
+        logger.warning(f"fut.gg warm-up skipped -> {e}")
+
+@app.on_event("shutdown")
+async def _shutdown():
+    await close_session()
+    await close_pg()
+    scraper = sys.modules.get("app.services.sbc_solution_scraper")
+    if scraper is not None:
+        scraper.shutdown_parse_pool()
+    # Playwright is only imported once a fetch fell back to the browser
+    browser = sys.modules.get("app.services.browser")
+    if browser is not None:
+        await browser.shutdown_browser()
+
 # ---- health & root ----
 @app.get("/")
 def root():
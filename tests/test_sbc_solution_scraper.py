@@ -0,0 +1,184 @@
+import asyncio
+import time
+import unittest
+
+import aiohttp
+
+from app.services import sbc_solution_scraper as scraper
+from app.services.sbc_solution_scraper import (
+    _CachedPage,
+    _parse_players_sync,
+    _parse_sbc_html,
+    _remember_page,
+    clear_caches,
+    list_sbc_player_slugs,
+)
+
+# Card layout as fut.gg serves it: each challenge's text sits in a nested <div>,
+# the anchor is a sibling of the header, and the cards follow one another.
+SBC_SET_PAGE = b"""<html><body><h1>Hero SBC</h1>
+<div class=card><h2>Top Form</h2><div><p>Min. 1 TOTW</p></div><a href="/25/squad-builder/111/">View Solution</a></div>
+<div class=card><h2>82 Rated Squad</h2><div><p>Min. Team Rating: 82</p><span>12,500 Coins</span></div><a href="/25/squad-builder/222/">View Solution</a></div>
+<div><h3>Rewards</h3><div>Rewards Pack</div></div>
+</body></html>"""
+
+
+class ParseSbcPageTest(unittest.TestCase):
+    def test_section_text_matches_per_tag_get_text(self):
+        # Each text tag after a header contributes its whole get_text(), nested tags
+        # included, up to the next header; block_text is stored as-is so it must not drift.
+        entry = _parse_sbc_html(SBC_SET_PAGE, "/players/hero/")
+        self.assertEqual(entry.slug, "players/hero")
+        self.assertEqual(entry.title, "Hero SBC")
+        self.assertEqual(
+            [(c.name, c.coin_text, c.block_text, c.view_solution_url) for c in entry.challenges],
+            [
+                (
+                    "Top Form",
+                    "12,500",
+                    "Min. 1 TOTW Min. 1 TOTW 82 Rated Squad Min. Team Rating: 82 12,500 Coins View Solution",
+                    "https://www.fut.gg/25/squad-builder/111/",
+                ),
+                (
+                    "82 Rated Squad",
+                    "12,500",
+                    "Min. Team Rating: 82 12,500 Coins Min. Team Rating: 82 12,500 Coins Rewards Rewards Pack",
+                    "https://www.fut.gg/25/squad-builder/222/",
+                ),
+            ],
+        )
+
+
+class ParseSolutionPlayersTest(unittest.TestCase):
+    URL = "https://www.fut.gg/25/squad-builder/abc/"
+
+    def codes(self, html: bytes):
+        return [p["variant_code"] for p in _parse_players_sync(html, self.URL)]
+
+    def test_src_inside_another_attribute_is_ignored(self):
+        html = b"""<img alt="see src='/player-item/25-99.a.webp'" src="/player-item/25-9.b.webp">"""
+        players = _parse_players_sync(html, self.URL)
+        self.assertEqual([p["variant_code"] for p in players], ["9"])
+        self.assertEqual(players[0]["image_url"], "https://www.fut.gg/player-item/25-9.b.webp")
+        self.assertEqual(players[0]["name"], "see src='/player-item/25-99.a.webp'")
+
+    def test_comments_and_scripts_are_skipped(self):
+        html = b"""<html><body>
+<!-- <img src="/player-item/25-1.a.webp"> -->
+<script>var t = '<img src="/player-item/25-2.a.webp">';</script>
+<img src=/player-item/25-3.a.webp alt=Three><img src='/player-item/25-4.a.webp'>
+</body></html>"""
+        self.assertEqual(self.codes(html), ["3", "4"])
+
+    def test_img_inside_another_tags_attribute_is_ignored(self):
+        html = b"""<div data-x='<img src="/player-item/25-5.a.webp">'><img src="/player-item/25-6.a.webp"></div>"""
+        self.assertEqual(self.codes(html), ["6"])
+
+
+class ListSbcPlayerSlugsTest(unittest.TestCase):
+    URL = "https://www.fut.gg/sbc/"
+
+    def setUp(self):
+        clear_caches()
+        self.addCleanup(clear_caches)
+
+    def slugs(self, body: bytes):
+        # a fresh cache entry means _fetch never touches the network
+        _remember_page(self.URL, _CachedPage(body=body, etag=None, last_modified=None, fetched_at=time.monotonic()))
+        return asyncio.run(list_sbc_player_slugs(None, self.URL))
+
+    def test_quoted_and_unquoted_hrefs(self):
+        body = b"""<a href="/sbc/players/a/">A</a><a href=/sbc/players/b>B</a>
+<!-- <a href="/sbc/players/c/">C</a> --><a href="/sbc/players/a/">A</a>"""
+        self.assertEqual(self.slugs(body), ["players/a", "players/b"])
+
+    def test_comment_only_page(self):
+        self.assertEqual(self.slugs(b"<!-- down for maintenance -->"), [])
+
+    def test_index_is_refetched_after_its_own_ttl(self):
+        self.assertEqual(self.slugs(b'<a href="/sbc/players/old/">Old</a>'), ["players/old"])
+        # two minutes on: past INDEX_CACHE_TTL, well inside the page cache's TTL
+        scraper._PAGE_CACHE[self.URL].fetched_at -= 120
+        scraper._PARSED.clear()
+        session = _StubSession({self.URL: (200, b'<a href="/sbc/players/new/">New</a>', {})})
+        self.assertEqual(asyncio.run(list_sbc_player_slugs(session, self.URL)), ["players/new"])
+        self.assertEqual(session.calls, [self.URL])
+
+
+class _StubResponse:
+    def __init__(self, url, status, body, headers):
+        self.url, self.status, self._body, self.headers = url, status, body, headers
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self):
+        return self._body
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(None, (), status=self.status)
+
+
+class _StubSession:
+    """Serves url -> (status, body, headers) and logs every GET."""
+
+    def __init__(self, pages):
+        self.pages, self.calls = pages, []
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls.append(url)
+        status, body, resp_headers = self.pages[url]
+        return _StubResponse(url, status, body, resp_headers)
+
+
+class FetchTest(unittest.TestCase):
+    def setUp(self):
+        clear_caches()
+        scraper._BROWSER_HOSTS.clear()
+        self.addCleanup(clear_caches)
+        self.addCleanup(scraper._BROWSER_HOSTS.clear)
+
+    def test_page_cache_is_capped_by_bytes(self):
+        original = scraper.PAGE_CACHE_MAX_BYTES
+        scraper.PAGE_CACHE_MAX_BYTES = 25
+        self.addCleanup(setattr, scraper, "PAGE_CACHE_MAX_BYTES", original)
+        for name in "abc":
+            page = _CachedPage(body=b"x" * 10, etag=None, last_modified=None, fetched_at=time.monotonic())
+            _remember_page(f"https://www.fut.gg/{name}", page)
+        self.assertEqual(list(scraper._PAGE_CACHE), ["https://www.fut.gg/b", "https://www.fut.gg/c"])
+        self.assertEqual(scraper._PAGE_CACHE_BYTES, 20)
+
+    def test_plain_403_is_not_a_bot_challenge(self):
+        a, b = "https://www.fut.gg/a", "https://www.fut.gg/b"
+        session = _StubSession({a: (403, b"Forbidden", {}), b: (200, b"<p>ok</p>", {})})
+
+        async def run():
+            with self.assertRaises(aiohttp.ClientResponseError):
+                await scraper._fetch(session, a)
+            return await scraper._fetch(session, b)
+
+        self.assertEqual(asyncio.run(run()), b"<p>ok</p>")
+        self.assertEqual(session.calls, [a, b])
+        self.assertEqual(len(scraper._BROWSER_HOSTS), 0)
+
+    def test_failed_browser_fetch_does_not_flag_the_host(self):
+        a = "https://www.fut.gg/a"
+        session = _StubSession({a: (403, b"", {"cf-mitigated": "challenge"})})
+
+        async def browser_down(url):
+            raise RuntimeError("Playwright is unavailable")
+
+        original = scraper._fetch_via_browser
+        scraper._fetch_via_browser = browser_down
+        self.addCleanup(setattr, scraper, "_fetch_via_browser", original)
+        with self.assertRaises(RuntimeError):
+            asyncio.run(scraper._fetch(session, a))
+        self.assertEqual(len(scraper._BROWSER_HOSTS), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()